@@ -6,19 +6,27 @@ Chains multiple AI services to generate short-form explainer videos.
 """
 
 import asyncio
-import json
+import hashlib
 import os
-import subprocess
+import random
+import shutil
+import textwrap
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 
+import aiofiles
+import anthropic
 import httpx
+import orjson
 from dotenv import load_dotenv
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TaskID, TextColumn
 
 load_dotenv()
 console = Console()
@@ -39,6 +47,10 @@ class Scene:
     visual_prompt: str
     text_overlay: Optional[str] = None
 
+    @property
+    def duration(self) -> float:
+        return self.end_time - self.start_time
+
 
 @dataclass
 class VideoScript:
@@ -65,6 +77,203 @@ class GeneratedAsset:
     metadata: dict = field(default_factory=dict)
 
 
+# =============================================================================
+# I/O Helpers
+# =============================================================================
+
+async def _run(*args: str) -> str:
+    """Run a command without blocking the event loop and return its stdout."""
+
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate()
+    if proc.returncode:
+        raise RuntimeError(f"{args[0]} failed: {stderr.decode(errors='replace')}")
+    return stdout.decode()
+
+
+async def _probe_duration(path: Path) -> float:
+    """Get audio duration in seconds, reading the MP3 header in-process."""
+
+    try:
+        from mutagen import MutagenError
+        from mutagen.mp3 import MP3
+    except ImportError:
+        pass
+    else:
+        try:
+            return MP3(str(path)).info.length
+        except MutagenError:
+            pass
+
+    # Fall back to ffprobe when mutagen is missing or can't parse the file
+    try:
+        output = await _run(
+            "ffprobe", "-v", "quiet", "-show_entries", "format=duration",
+            "-of", "csv=p=0", str(path),
+        )
+    except RuntimeError:
+        return 0
+    return float(output.strip()) if output.strip() else 0
+
+
+# Hardware H.264 encoders in order of preference, with tuning and rate
+# control roughly matching libx264's default CRF 23 (their own defaults are
+# low fixed bitrates that visibly soften the output)
+_H264_ENCODERS = [
+    ("h264_nvenc", ["-preset", "p4", "-rc", "vbr", "-cq", "23", "-b:v", "0"]),
+    ("h264_videotoolbox", ["-b:v", "8M"]),
+    ("h264_qsv", ["-preset", "veryfast", "-global_quality", "23"]),
+]
+_h264_args: Optional[list[str]] = None
+
+
+async def _h264_encoder_args() -> list[str]:
+    """Pick the fastest working H.264 encoder, probing ffmpeg once per process."""
+
+    global _h264_args
+    if _h264_args is not None:
+        return _h264_args
+
+    _h264_args = ["-c:v", "libx264", "-preset", "veryfast"]
+    try:
+        available = await _run("ffmpeg", "-hide_banner", "-encoders")
+    except (OSError, RuntimeError):
+        return _h264_args
+
+    for encoder, flags in _H264_ENCODERS:
+        if encoder in available and await _encoder_works(encoder):
+            _h264_args = ["-c:v", encoder, *flags]
+            break
+
+    return _h264_args
+
+
+async def _encoder_works(encoder: str) -> bool:
+    """Check an encoder can run; builds list encoders whose hardware is absent."""
+
+    try:
+        await _run(
+            "ffmpeg", "-hide_banner", "-f", "lavfi",
+            "-i", "color=size=256x256:duration=0.1",
+            "-c:v", encoder, "-f", "null", "-",
+        )
+    except RuntimeError:
+        return False
+    return True
+
+
+async def _save_stream(response: httpx.Response, path: Path):
+    """Write a streamed response body to disk chunk by chunk."""
+
+    response.raise_for_status()
+    async with aiofiles.open(path, "wb") as f:
+        async for chunk in response.aiter_bytes(chunk_size=1 << 20):
+            await f.write(chunk)
+
+
+@asynccontextmanager
+async def _open_client(client: Optional[httpx.AsyncClient]):
+    """Yield the injected client, or a short-lived one when none is open."""
+
+    if client is not None and not client.is_closed:
+        yield client
+    else:
+        async with httpx.AsyncClient(timeout=60.0) as own_client:
+            yield own_client
+
+
+# =============================================================================
+# Caching
+# =============================================================================
+
+class ScriptCache:
+    """Disk cache of parsed script JSON, keyed by a hash of the request."""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(topic: str, style: str, duration: int, model: str) -> str:
+        return hashlib.sha256(f"{topic}|{style}|{duration}|{model}".encode()).hexdigest()
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """Return the cached script data, or None on a miss."""
+        path = self.cache_dir / f"{key}.json"
+        if not path.exists():
+            return None
+        return orjson.loads(path.read_bytes())
+
+    def update(self, key: str, value: dict):
+        """Store script data under key."""
+        (self.cache_dir / f"{key}.json").write_bytes(orjson.dumps(value))
+
+    def discard(self, key: str):
+        """Remove the entry for key, if any."""
+        (self.cache_dir / f"{key}.json").unlink(missing_ok=True)
+
+
+class AssetCache:
+    """Disk cache of generated audio/video files, keyed by a hash of their inputs.
+
+    Files are hard-linked in and out of the cache, so a hit costs no copy and
+    deleting the working file leaves the cached one intact. Writers must
+    therefore replace a working file rather than overwrite it in place.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        return hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()
+
+    def lookup(self, kind: str, key: str, dest: Path) -> Optional[GeneratedAsset]:
+        """Link the cached file to dest (keeping its suffix), or None on a miss."""
+        meta_path = self.cache_dir / kind / f"{key}.json"
+        if not meta_path.exists():
+            return None
+        meta = orjson.loads(meta_path.read_bytes())
+        cached = meta_path.with_suffix(meta["suffix"])
+        if not cached.exists():
+            return None
+
+        dest = dest.with_suffix(meta["suffix"])
+        _link(cached, dest)
+        return GeneratedAsset(
+            path=dest,
+            asset_type=meta["asset_type"],
+            duration=meta["duration"],
+            metadata=meta["metadata"],
+        )
+
+    def update(self, kind: str, key: str, asset: GeneratedAsset):
+        """Store a generated asset under key."""
+        kind_dir = self.cache_dir / kind
+        kind_dir.mkdir(parents=True, exist_ok=True)
+        _link(asset.path, kind_dir / f"{key}{asset.path.suffix}")
+        (kind_dir / f"{key}.json").write_bytes(orjson.dumps({
+            "suffix": asset.path.suffix,
+            "asset_type": asset.asset_type,
+            "duration": asset.duration,
+            "metadata": asset.metadata,
+        }))
+
+
+def _link(src: Path, dest: Path):
+    """Hard-link src to dest, copying when linking isn't possible."""
+
+    dest.unlink(missing_ok=True)
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+
+
 # =============================================================================
 # Script Generation Providers
 # =============================================================================
@@ -79,34 +288,9 @@ class ScriptProvider(ABC):
         pass
 
 
-class ClaudeScriptProvider(ScriptProvider):
-    """Generate scripts using Claude API."""
-
-    def __init__(self):
-        self.api_key = os.getenv("ANTHROPIC_API_KEY")
-        self.base_url = "https://api.anthropic.com/v1/messages"
-
-    async def generate_script(
-        self, topic: str, style: str, duration: int = 60
-    ) -> VideoScript:
-        prompt = f"""Create a TikTok video script about: {topic}
-
-Style: {style}
-Duration: {duration} seconds
-
-Return a JSON object with this structure:
-{{
-    "title": "Video title",
-    "scenes": [
-        {{
-            "start_time": 0,
-            "end_time": 5,
-            "narration": "What the narrator says",
-            "visual_prompt": "Description of visuals to generate",
-            "text_overlay": "Bold text shown on screen (optional)"
-        }}
-    ]
-}}
+# Static instructions go in the system prompt, ahead of anything that varies
+# per request, so the prefix is byte-identical across calls and cacheable.
+SCRIPT_INSTRUCTIONS = """Create a TikTok video script for the topic, style, and duration given by the user, and submit it with the emit_script tool.
 
 Requirements:
 - Hook in first 3 seconds
@@ -114,50 +298,154 @@ Requirements:
 - Each scene 5-15 seconds
 - Narration should be conversational, engaging
 - Visual prompts should be specific for AI image/video generation
-- Text overlays for key statistics or emphasis
+- Text overlays for key statistics or emphasis"""
+
+# Forcing this tool makes the API return the script as structured input,
+# so there is no free-form JSON to extract (or fail to parse)
+SCRIPT_TOOL = {
+    "name": "emit_script",
+    "description": "Submit the finished video script.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "title": {"type": "string", "description": "Video title"},
+            "scenes": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "start_time": {"type": "number"},
+                        "end_time": {"type": "number"},
+                        "narration": {
+                            "type": "string",
+                            "description": "What the narrator says",
+                        },
+                        "visual_prompt": {
+                            "type": "string",
+                            "description": "Description of visuals to generate",
+                        },
+                        "text_overlay": {
+                            "type": "string",
+                            "description": "Bold text shown on screen (optional)",
+                        },
+                    },
+                    "required": ["start_time", "end_time", "narration", "visual_prompt"],
+                },
+            },
+        },
+        "required": ["title", "scenes"],
+    },
+}
 
-Return ONLY the JSON, no other text."""
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.base_url,
-                headers={
-                    "x-api-key": self.api_key,
-                    "content-type": "application/json",
-                    "anthropic-version": "2023-06-01",
-                },
-                json={
-                    "model": "claude-sonnet-4-20250514",
-                    "max_tokens": 2000,
-                    "messages": [{"role": "user", "content": prompt}],
-                },
-                timeout=60.0,
-            )
-            response.raise_for_status()
+class ClaudeScriptProvider(ScriptProvider):
+    """Generate scripts using Claude API."""
 
-            content = response.json()["content"][0]["text"]
-            # Extract JSON from response
-            data = json.loads(content)
-
-            scenes = [
-                Scene(
-                    index=i,
-                    start_time=s["start_time"],
-                    end_time=s["end_time"],
-                    narration=s["narration"],
-                    visual_prompt=s["visual_prompt"],
-                    text_overlay=s.get("text_overlay"),
-                )
-                for i, s in enumerate(data["scenes"])
-            ]
-
-            return VideoScript(
-                title=data["title"],
-                topic=topic,
-                style=style,
-                total_duration=duration,
-                scenes=scenes,
+    def __init__(self, cache: Optional[ScriptCache] = None):
+        self.api_key = os.getenv("ANTHROPIC_API_KEY")
+        self.cache = cache
+        self.model = "claude-sonnet-4-20250514"
+        # The SDK owns its connection pool (and retries); it is deliberately
+        # not given the pipeline's shared HTTP client
+        self._sdk = anthropic.AsyncAnthropic(api_key=self.api_key)
+
+    async def generate_script(
+        self, topic: str, style: str, duration: int = 60
+    ) -> VideoScript:
+        cache_key = None
+        if self.cache is not None:
+            cache_key = ScriptCache.make_key(topic, style, duration, self.model)
+            data = self.cache.lookup(cache_key)
+            if data is not None:
+                try:
+                    script = self._build_script(data, topic, style, duration)
+                except (KeyError, TypeError):
+                    # Unusable entry; drop it and ask the API again
+                    self.cache.discard(cache_key)
+                else:
+                    console.print("[dim]Using cached script[/dim]")
+                    return script
+
+        data = await self._request_script(topic, style, duration)
+        script = self._build_script(data, topic, style, duration)
+
+        # Only cache data that built a valid script
+        if cache_key is not None:
+            self.cache.update(cache_key, data)
+
+        return script
+
+    async def _request_script(self, topic: str, style: str, duration: int) -> dict:
+        """Call the Claude API and return the script data."""
+
+        prompt = f"Topic: {topic}\nStyle: {style}\nDuration: {duration} seconds"
+
+        message = await self._sdk.messages.create(
+            model=self.model,
+            max_tokens=2000,
+            system=[
+                {
+                    "type": "text",
+                    "text": SCRIPT_INSTRUCTIONS,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+            messages=[{"role": "user", "content": prompt}],
+            tools=[SCRIPT_TOOL],
+            tool_choice={"type": "tool", "name": SCRIPT_TOOL["name"]},
+            timeout=60.0,
+        )
+        self._log_cache_usage(message.usage)
+
+        # A truncated tool call would carry partial (or no) script data
+        if message.stop_reason == "max_tokens":
+            raise RuntimeError("Script generation hit max_tokens; the script is incomplete")
+
+        # Tool input arrives already parsed
+        data = next(
+            (block.input for block in message.content if block.type == "tool_use"), None
+        )
+        if data is None:
+            raise RuntimeError(f"Claude did not call {SCRIPT_TOOL['name']} (stop reason: {message.stop_reason})")
+        return data
+
+    @staticmethod
+    def _log_cache_usage(usage):
+        """Print the share of input tokens served from the prompt cache.
+
+        Silent while the cached prefix is below the API's minimum length,
+        since no cache is read or written then.
+        """
+
+        cache_read = usage.cache_read_input_tokens or 0
+        cache_write = usage.cache_creation_input_tokens or 0
+        if not (cache_read or cache_write):
+            return
+        total = cache_read + cache_write + usage.input_tokens
+        console.print(f"[dim]Prompt cache hit rate: {cache_read / total:.0%}[/dim]")
+
+    def _build_script(
+        self, data: dict, topic: str, style: str, duration: int
+    ) -> VideoScript:
+        scenes = [
+            Scene(
+                index=i,
+                start_time=s["start_time"],
+                end_time=s["end_time"],
+                narration=s["narration"],
+                visual_prompt=s["visual_prompt"],
+                text_overlay=s.get("text_overlay"),
             )
+            for i, s in enumerate(data["scenes"])
+        ]
+
+        return VideoScript(
+            title=data["title"],
+            topic=topic,
+            style=style,
+            total_duration=duration,
+            scenes=scenes,
+        )
 
 
 # =============================================================================
@@ -177,19 +465,50 @@ class VideoProvider(ABC):
 class ReplicateVideoProvider(VideoProvider):
     """Generate videos using Replicate API."""
 
-    def __init__(self, model: str = "stability-ai/stable-video-diffusion"):
+    def __init__(
+        self,
+        model: str = "stability-ai/stable-video-diffusion",
+        client: Optional[httpx.AsyncClient] = None,
+    ):
         self.api_token = os.getenv("REPLICATE_API_TOKEN")
+        self.client = client
         self.model = model
         self.base_url = "https://api.replicate.com/v1/predictions"
+        self.prefer_wait = 30  # seconds the initial POST may block
+        self.max_wait = 600.0  # seconds before giving up on a prediction
+
+    async def _wait_for_prediction(
+        self, client: httpx.AsyncClient, prediction: dict
+    ) -> dict:
+        """Poll a prediction with jittered exponential backoff until it finishes."""
+
+        prediction_url = prediction["urls"]["get"]
+        delay = 0.5
+        while prediction["status"] not in ("succeeded", "failed", "canceled"):
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.8 + random.uniform(0, 0.2), 5.0)
+            response = await client.get(
+                prediction_url,
+                headers={"Authorization": f"Token {self.api_token}"},
+            )
+            prediction = response.json()
+
+        if prediction["status"] != "succeeded":
+            raise RuntimeError(f"Video generation failed: {prediction.get('error')}")
+        return prediction
 
     async def generate_clip(
         self, prompt: str, duration: float, output_path: Path
     ) -> GeneratedAsset:
-        async with httpx.AsyncClient() as client:
-            # Start prediction
+        async with _open_client(self.client) as client:
+            # Start prediction; "Prefer: wait" holds the request open so short
+            # jobs come back already finished and never need polling
             response = await client.post(
                 self.base_url,
-                headers={"Authorization": f"Token {self.api_token}"},
+                headers={
+                    "Authorization": f"Token {self.api_token}",
+                    "Prefer": f"wait={self.prefer_wait}",
+                },
                 json={
                     "version": self.model,
                     "input": {
@@ -197,103 +516,87 @@ class ReplicateVideoProvider(VideoProvider):
                         "num_frames": int(duration * 24),  # 24fps
                     },
                 },
-                timeout=30.0,
+                timeout=self.prefer_wait + 30.0,
             )
             response.raise_for_status()
             prediction = response.json()
 
-            # Poll for completion
-            prediction_url = prediction["urls"]["get"]
-            while True:
-                await asyncio.sleep(5)
-                response = await client.get(
-                    prediction_url,
-                    headers={"Authorization": f"Token {self.api_token}"},
-                )
-                prediction = response.json()
-
-                if prediction["status"] == "succeeded":
-                    video_url = prediction["output"]
-                    break
-                elif prediction["status"] == "failed":
-                    raise RuntimeError(f"Video generation failed: {prediction.get('error')}")
+            prediction = await asyncio.wait_for(
+                self._wait_for_prediction(client, prediction),
+                timeout=self.max_wait,
+            )
+            video_url = prediction["output"]
 
             # Download video
-            video_response = await client.get(video_url)
-            output_path.write_bytes(video_response.content)
-
-            return GeneratedAsset(
-                path=output_path,
-                asset_type="video",
-                duration=duration,
-                metadata={"model": self.model, "prompt": prompt},
-            )
+            async with client.stream("GET", video_url) as video_response:
+                await _save_stream(video_response, output_path)
+
+        return GeneratedAsset(
+            path=output_path,
+            asset_type="video",
+            duration=duration,
+            metadata={"model": self.model, "prompt": prompt},
+        )
+
+
+@lru_cache(maxsize=None)
+def _placeholder_font():
+    """Load the placeholder font once rather than once per scene."""
+
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 40)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def _render_placeholder_png(prompt: str, image_path: Path):
+    """Create placeholder image using PIL.
+
+    Module-level so it can run in a ProcessPoolExecutor worker.
+    """
+
+    from PIL import Image, ImageDraw
+
+    img = Image.new("RGB", (1080, 1920), color=(30, 30, 40))
+    draw = ImageDraw.Draw(img)
+
+    # Add prompt text
+    lines = textwrap.wrap(prompt, width=30)[:5]
+    draw.multiline_text(
+        (100, 800), "\n".join(lines),
+        fill=(255, 255, 255), font=_placeholder_font(), spacing=10,
+    )
+
+    img.save(image_path)
 
 
 class FallbackImageProvider(VideoProvider):
     """Generate static images as fallback (cheaper, always available)."""
 
-    def __init__(self):
+    def __init__(self, executor: Optional[Executor] = None):
         self.api_token = os.getenv("REPLICATE_API_TOKEN")
+        self.executor = executor
 
     async def generate_clip(
         self, prompt: str, duration: float, output_path: Path
     ) -> GeneratedAsset:
-        """Generate an image and convert to video with Ken Burns effect."""
+        """Generate a still image; VideoCompiler turns it into a Ken Burns clip."""
 
         # For demo: create a placeholder
         # In production, use SDXL or similar via Replicate
         console.print(f"[yellow]Generating image for: {prompt[:50]}...[/yellow]")
 
-        # Create placeholder image using PIL
-        from PIL import Image, ImageDraw, ImageFont
-
-        img = Image.new("RGB", (1080, 1920), color=(30, 30, 40))
-        draw = ImageDraw.Draw(img)
-
-        # Add prompt text
-        try:
-            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 40)
-        except OSError:
-            font = ImageFont.load_default()
-
-        # Wrap text
-        words = prompt.split()
-        lines = []
-        current_line = []
-        for word in words:
-            current_line.append(word)
-            if len(" ".join(current_line)) > 30:
-                lines.append(" ".join(current_line[:-1]))
-                current_line = [word]
-        if current_line:
-            lines.append(" ".join(current_line))
-
-        y_offset = 800
-        for line in lines[:5]:
-            draw.text((100, y_offset), line, fill=(255, 255, 255), font=font)
-            y_offset += 50
-
+        # PIL rendering is CPU-bound; run it off the event loop (in worker
+        # processes when an executor is provided, so scenes use every core)
         image_path = output_path.with_suffix(".png")
-        img.save(image_path)
-
-        # Convert to video with FFmpeg
-        subprocess.run([
-            "ffmpeg", "-y",
-            "-loop", "1",
-            "-i", str(image_path),
-            "-c:v", "libx264",
-            "-t", str(duration),
-            "-pix_fmt", "yuv420p",
-            "-vf", "scale=1080:1920,zoompan=z='min(zoom+0.001,1.2)':d=1:s=1080x1920",
-            str(output_path),
-        ], capture_output=True, check=True)
-
-        image_path.unlink()  # Clean up image
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, _render_placeholder_png, prompt, image_path)
 
         return GeneratedAsset(
-            path=output_path,
-            asset_type="video",
+            path=image_path,
+            asset_type="image",
             duration=duration,
             metadata={"type": "image_fallback", "prompt": prompt},
         )
@@ -308,29 +611,41 @@ class TTSProvider(ABC):
 
     @abstractmethod
     async def generate_audio(
-        self, text: str, output_path: Path, voice: str = "default"
+        self, text: str, output_path: Path, voice: Optional[str] = None
     ) -> GeneratedAsset:
+        """Synthesize text, in the provider's default voice when voice is None."""
         pass
 
 
 class EdgeTTSProvider(TTSProvider):
     """Free TTS using Microsoft Edge."""
 
+    # Edge-TTS streams constant-bitrate MP3 (audio-24khz-48kbitrate-mono-mp3)
+    bitrate = 48_000
+
+    def __init__(self, voice: str = "en-US-GuyNeural", rate: str = "+10%"):
+        self.voice = voice
+        self.rate = rate
+
     async def generate_audio(
-        self, text: str, output_path: Path, voice: str = "en-US-GuyNeural"
+        self, text: str, output_path: Path, voice: Optional[str] = None
     ) -> GeneratedAsset:
         import edge_tts
 
-        communicate = edge_tts.Communicate(text, voice, rate="+10%")
-        await communicate.save(str(output_path))
+        voice = voice or self.voice
+        communicate = edge_tts.Communicate(text, voice, rate=self.rate)
 
-        # Get duration using ffprobe
-        result = subprocess.run(
-            ["ffprobe", "-v", "quiet", "-show_entries", "format=duration",
-             "-of", "csv=p=0", str(output_path)],
-            capture_output=True, text=True
-        )
-        duration = float(result.stdout.strip()) if result.stdout.strip() else 0
+        # Write the stream by hand (save() streams to disk just the same) so
+        # the audio bytes can be counted along the way
+        audio_bytes = 0
+        async with aiofiles.open(output_path, "wb") as f:
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    await f.write(chunk["data"])
+                    audio_bytes += len(chunk["data"])
+
+        # Constant bitrate, so the byte count gives the duration directly
+        duration = audio_bytes * 8 / self.bitrate
 
         return GeneratedAsset(
             path=output_path,
@@ -343,33 +658,36 @@ class EdgeTTSProvider(TTSProvider):
 class OpenAITTSProvider(TTSProvider):
     """TTS using OpenAI API."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        model: str = "tts-1",
+        voice: str = "onyx",
+    ):
         self.api_key = os.getenv("OPENAI_API_KEY")
+        self.client = client
+        self.model = model
+        self.voice = voice
 
     async def generate_audio(
-        self, text: str, output_path: Path, voice: str = "onyx"
+        self, text: str, output_path: Path, voice: Optional[str] = None
     ) -> GeneratedAsset:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
+        voice = voice or self.voice
+        async with _open_client(self.client) as client:
+            async with client.stream(
+                "POST",
                 "https://api.openai.com/v1/audio/speech",
                 headers={"Authorization": f"Bearer {self.api_key}"},
                 json={
-                    "model": "tts-1",
+                    "model": self.model,
                     "input": text,
                     "voice": voice,
                 },
                 timeout=60.0,
-            )
-            response.raise_for_status()
-            output_path.write_bytes(response.content)
+            ) as response:
+                await _save_stream(response, output_path)
 
-        # Get duration
-        result = subprocess.run(
-            ["ffprobe", "-v", "quiet", "-show_entries", "format=duration",
-             "-of", "csv=p=0", str(output_path)],
-            capture_output=True, text=True
-        )
-        duration = float(result.stdout.strip()) if result.stdout.strip() else 0
+        duration = await _probe_duration(output_path)
 
         return GeneratedAsset(
             path=output_path,
@@ -390,7 +708,7 @@ class VideoCompiler:
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-    def compile(
+    async def compile(
         self,
         video_clips: list[GeneratedAsset],
         audio: GeneratedAsset,
@@ -401,37 +719,67 @@ class VideoCompiler:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_path = self.output_dir / f"video_{timestamp}.mp4"
 
+        if video_clips and all(clip.asset_type == "image" for clip in video_clips):
+            return await self._compile_images(video_clips, audio, output_path)
+
         # Create concat file
         concat_file = self.output_dir / "concat.txt"
         with open(concat_file, "w") as f:
             for clip in video_clips:
                 f.write(f"file '{clip.path.absolute()}'\n")
 
-        # Concatenate clips
-        temp_video = self.output_dir / "temp_concat.mp4"
-        subprocess.run([
+        # Concatenate clips and add audio in a single pass
+        await _run(
             "ffmpeg", "-y",
             "-f", "concat",
             "-safe", "0",
             "-i", str(concat_file),
-            "-c", "copy",
-            str(temp_video),
-        ], capture_output=True, check=True)
-
-        # Add audio
-        subprocess.run([
-            "ffmpeg", "-y",
-            "-i", str(temp_video),
             "-i", str(audio.path),
+            "-map", "0:v:0",
+            "-map", "1:a:0",
             "-c:v", "copy",
             "-c:a", "aac",
             "-shortest",
             str(output_path),
-        ], capture_output=True, check=True)
+        )
 
         # Cleanup
         concat_file.unlink()
-        temp_video.unlink()
+
+        return output_path
+
+    async def _compile_images(
+        self,
+        images: list[GeneratedAsset],
+        audio: GeneratedAsset,
+        output_path: Path,
+    ) -> Path:
+        """Render still images as Ken Burns clips and mux audio in one ffmpeg run."""
+
+        inputs = []
+        filters = []
+        for i, image in enumerate(images):
+            inputs += ["-loop", "1", "-t", str(image.duration), "-i", str(image.path)]
+            filters.append(
+                f"[{i}:v]scale=1080:1920,"
+                f"zoompan=z='min(zoom+0.001,1.2)':d=1:s=1080x1920[v{i}]"
+            )
+        concat_inputs = "".join(f"[v{i}]" for i in range(len(images)))
+        filters.append(f"{concat_inputs}concat=n={len(images)}:v=1:a=0[outv]")
+
+        await _run(
+            "ffmpeg", "-y",
+            *inputs,
+            "-i", str(audio.path),
+            "-filter_complex", ";".join(filters),
+            "-map", "[outv]",
+            "-map", f"{len(images)}:a:0",
+            *await _h264_encoder_args(),
+            "-pix_fmt", "yuv420p",
+            "-c:a", "aac",
+            "-shortest",
+            str(output_path),
+        )
 
         return output_path
 
@@ -449,6 +797,8 @@ class VideoPipeline:
         video_provider: VideoProvider,
         tts_provider: TTSProvider,
         output_dir: Path = Path("./output"),
+        max_concurrency: int = 8,
+        asset_cache: Optional[AssetCache] = None,
     ):
         self.script_provider = script_provider
         self.video_provider = video_provider
@@ -456,27 +806,149 @@ class VideoPipeline:
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.compiler = VideoCompiler(output_dir)
+        self.max_concurrency = max_concurrency
+        self.asset_cache = asset_cache
+
+    def _bind_client(self, client: httpx.AsyncClient):
+        """Share the pipeline's HTTP client with providers that lack an open one."""
+
+        for provider in (self.script_provider, self.video_provider, self.tts_provider):
+            if not hasattr(provider, "client"):
+                continue
+            if provider.client is None or provider.client.is_closed:
+                provider.client = client
+
+    async def _cached_asset(
+        self,
+        kind: str,
+        key_parts: tuple,
+        dest: Path,
+        generate: Callable[[], Awaitable[GeneratedAsset]],
+    ) -> GeneratedAsset:
+        """Reuse a cached asset for these inputs, or generate and cache it."""
+
+        if self.asset_cache is not None:
+            key = AssetCache.make_key(*key_parts)
+            asset = self.asset_cache.lookup(kind, key, dest)
+            if asset is not None:
+                return asset
+
+        # Working files left by an earlier run may be hard links into the
+        # cache, and providers overwrite their output in place; unlink them
+        # so a fresh file is written rather than the cached one clobbered
+        for stale in dest.parent.glob(f"{dest.stem}.*"):
+            stale.unlink()
+
+        asset = await generate()
+        if self.asset_cache is None:
+            return asset
+        self.asset_cache.update(kind, key, asset)
+        return asset
+
+    async def _generate_voiceover(
+        self, progress: Progress, script: VideoScript
+    ) -> GeneratedAsset:
+        """Generate the narration audio for the whole script."""
+
+        task = progress.add_task("Generating voiceover...", total=None)
+        audio_path = self.output_dir / "voiceover.mp3"
+        narration = script.to_narration()
+        audio = await self._cached_asset(
+            "audio",
+            (
+                type(self.tts_provider).__name__,
+                getattr(self.tts_provider, "model", ""),
+                getattr(self.tts_provider, "voice", ""),
+                getattr(self.tts_provider, "rate", ""),
+                narration,
+            ),
+            audio_path,
+            lambda: self.tts_provider.generate_audio(narration, audio_path),
+        )
+        progress.update(task, description=f"[green]Voiceover generated! ({audio.duration:.1f}s)")
+        return audio
+
+    async def _generate_scene_clip(
+        self, progress: Progress, task: TaskID, index: int, scene: Scene
+    ) -> GeneratedAsset:
+        """Generate the clip for one scene, bounded by the provider semaphore."""
+
+        clip_path = self.output_dir / f"clip_{index:02d}.mp4"
+        clip_duration = scene.duration
+
+        async def generate_clip() -> GeneratedAsset:
+            async with self._semaphore:
+                return await self.video_provider.generate_clip(
+                    scene.visual_prompt, clip_duration, clip_path
+                )
+
+        clip = await self._cached_asset(
+            "clips",
+            (
+                type(self.video_provider).__name__,
+                getattr(self.video_provider, "model", ""),
+                scene.visual_prompt,
+                round(clip_duration, 2),
+            ),
+            clip_path,
+            generate_clip,
+        )
+        progress.advance(task)
+        return clip
 
     async def generate(self, topic: str, style: str, duration: int = 60) -> Path:
         """Generate a complete video."""
 
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            # Step 1: Generate script
-            task = progress.add_task("Generating script...", total=None)
-            script = await self.script_provider.generate_script(topic, style, duration)
-            progress.update(task, description="[green]Script generated!")
-
-            console.print(f"\n[bold]Title:[/bold] {script.title}")
-            console.print(f"[bold]Scenes:[/bold] {len(script.scenes)}\n")
-
-            # Save script
-            script_path = self.output_dir / f"script_{datetime.now():%Y%m%d_%H%M%S}.json"
-            with open(script_path, "w") as f:
-                json.dump({
+        # Worker processes for CPU-bound rendering, only for providers that
+        # take an executor and weren't given one; shut down after the run
+        needs_pool = (
+            hasattr(self.video_provider, "executor")
+            and self.video_provider.executor is None
+        )
+        if not needs_pool:
+            return await self._generate(topic, style, duration)
+
+        with ProcessPoolExecutor() as pool:
+            self.video_provider.executor = pool
+            try:
+                return await self._generate(topic, style, duration)
+            finally:
+                self.video_provider.executor = None
+
+    async def _generate(self, topic: str, style: str, duration: int) -> Path:
+        """Run the pipeline steps for generate()."""
+
+        # Limit in-flight provider calls to respect API rate limits
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # One pooled client for every provider call in this run, so requests
+        # reuse TCP/TLS connections instead of reconnecting each time
+        async with httpx.AsyncClient(
+            http2=True,
+            timeout=60.0,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+        ) as client:
+            self._bind_client(client)
+
+            # Skip redraws entirely when output isn't a terminal (e.g. CI logs)
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                console=console,
+                transient=True,
+                disable=not console.is_terminal,
+            ) as progress:
+                # Step 1: Generate script
+                task = progress.add_task("Generating script...", total=None)
+                script = await self.script_provider.generate_script(topic, style, duration)
+                progress.update(task, description="[green]Script generated!")
+
+                console.print(f"\n[bold]Title:[/bold] {script.title}")
+                console.print(f"[bold]Scenes:[/bold] {len(script.scenes)}\n")
+
+                # Save script
+                script_path = self.output_dir / f"script_{datetime.now():%Y%m%d_%H%M%S}.json"
+                script_path.write_bytes(orjson.dumps({
                     "title": script.title,
                     "topic": script.topic,
                     "style": script.style,
@@ -490,40 +962,46 @@ class VideoPipeline:
                         }
                         for s in script.scenes
                     ],
-                }, f, indent=2)
-
-            # Step 2: Generate TTS
-            task = progress.add_task("Generating voiceover...", total=None)
-            audio_path = self.output_dir / "voiceover.mp3"
-            audio = await self.tts_provider.generate_audio(
-                script.to_narration(), audio_path
-            )
-            progress.update(task, description=f"[green]Voiceover generated! ({audio.duration:.1f}s)")
-
-            # Step 3: Generate video clips for each scene
-            clips = []
-            for i, scene in enumerate(script.scenes):
-                task = progress.add_task(
-                    f"Generating scene {i+1}/{len(script.scenes)}...", total=None
-                )
-                clip_path = self.output_dir / f"clip_{i:02d}.mp4"
-                clip_duration = scene.end_time - scene.start_time
-
-                clip = await self.video_provider.generate_clip(
-                    scene.visual_prompt, clip_duration, clip_path
-                )
-                clips.append(clip)
-                progress.update(task, description=f"[green]Scene {i+1} complete!")
-
-            # Step 4: Compile final video
-            task = progress.add_task("Compiling final video...", total=None)
-            final_path = self.compiler.compile(clips, audio, script)
-            progress.update(task, description="[green]Video compiled!")
-
-            # Cleanup clips
-            for clip in clips:
-                clip.path.unlink()
-            audio.path.unlink()
+                }, option=orjson.OPT_INDENT_2))
+
+                # Steps 2 & 3: Generate TTS and video clips concurrently. The
+                # task group cancels every sibling if any one of them fails.
+                async with asyncio.TaskGroup() as tg:
+                    audio_task = tg.create_task(self._generate_voiceover(progress, script))
+
+                    # One progress row for all scenes rather than one per scene
+                    scenes_task = progress.add_task("Generating scenes...", total=None)
+
+                    # Scenes with identical visuals share one generated clip
+                    unique_clips: dict[tuple[str, float], asyncio.Task] = {}
+                    clip_tasks = []
+                    for i, scene in enumerate(script.scenes):
+                        key = (scene.visual_prompt, round(scene.duration, 2))
+                        if key not in unique_clips:
+                            unique_clips[key] = tg.create_task(
+                                self._generate_scene_clip(progress, scenes_task, i, scene)
+                            )
+                        clip_tasks.append(unique_clips[key])
+                    progress.update(scenes_task, total=len(unique_clips))
+
+                    reused = len(clip_tasks) - len(unique_clips)
+                    if reused:
+                        console.print(f"[dim]Reusing clips for {reused} duplicate scene(s)[/dim]")
+
+                progress.update(scenes_task, description="[green]Scenes complete!")
+                audio = audio_task.result()
+                clips = [clip_task.result() for clip_task in clip_tasks]
+
+                # Step 4: Compile final video
+                task = progress.add_task("Compiling final video...", total=None)
+                final_path = await self.compiler.compile(clips, audio, script)
+                progress.update(task, description="[green]Video compiled!")
+
+                # Cleanup working files (duplicate scenes share a file);
+                # cached assets are separate hard links and survive this
+                for clip_path in {clip.path for clip in clips}:
+                    clip_path.unlink()
+                audio.path.unlink()
 
         console.print(f"\n[bold green]Video saved to:[/bold green] {final_path}")
         return final_path
@@ -533,6 +1011,16 @@ class VideoPipeline:
 # CLI Interface
 # =============================================================================
 
+def _run_async(coro):
+    """Run a coroutine on uvloop when it's installed (not on Windows)."""
+
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    return uvloop.run(coro)
+
+
 def main():
     """CLI entry point."""
     import typer
@@ -545,6 +1033,7 @@ def main():
         style: str = typer.Option("dramatic", help="Video style (dramatic, educational, humorous)"),
         duration: int = typer.Option(60, help="Target duration in seconds"),
         use_openai_tts: bool = typer.Option(False, help="Use OpenAI TTS instead of Edge-TTS"),
+        no_cache: bool = typer.Option(False, "--no-cache", help="Regenerate the script, voiceover and clips instead of reusing cached ones"),
     ):
         """Generate a TikTok-style explainer video."""
 
@@ -554,7 +1043,11 @@ def main():
         console.print(f"Duration: {duration}s\n")
 
         # Initialize providers
-        script_provider = ClaudeScriptProvider()
+        output_dir = Path("./output")
+        cache_dir = output_dir / ".cache"
+        script_cache = None if no_cache else ScriptCache(cache_dir)
+        asset_cache = None if no_cache else AssetCache(cache_dir)
+        script_provider = ClaudeScriptProvider(cache=script_cache)
         video_provider = FallbackImageProvider()  # Use image fallback by default
         tts_provider = OpenAITTSProvider() if use_openai_tts else EdgeTTSProvider()
 
@@ -563,9 +1056,11 @@ def main():
             script_provider=script_provider,
             video_provider=video_provider,
             tts_provider=tts_provider,
+            output_dir=output_dir,
+            asset_cache=asset_cache,
         )
 
-        asyncio.run(pipeline.generate(topic, style, duration))
+        _run_async(pipeline.generate(topic, style, duration))
 
     @app.command()
     def list_providers():
@@ -7,12 +7,19 @@ then the Rust engine uses these assets for frame-by-frame video creation.
 """
 
 import asyncio
+import hashlib
+import io
 import os
+import random
+import shutil
+import tempfile
+import threading
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
 import httpx
+import numpy as np
 from dotenv import load_dotenv
 from PIL import Image
 from rich.console import Console
@@ -188,6 +195,16 @@ STYLES = {
 }
 
 
+# Generated images are cached here by a hash of everything that shapes them
+ASSET_CACHE_DIR = Path.home() / ".cache" / "asset_gen"
+
+# Model settings, shared by the API requests and the cache key
+SDXL_VERSION = "39ed52f2a78e934b3ba6e2a89f5b1c712de7dfea535525255b1aa35c5565e08b"
+SDXL_STEPS = 30
+OPENAI_IMAGE_MODEL = "dall-e-3"
+OPENAI_IMAGE_QUALITY = "standard"
+
+
 # =============================================================================
 # Image Generation Providers
 # =============================================================================
@@ -199,6 +216,50 @@ class ImageGenerator:
         self.provider = provider
         self.replicate_token = os.getenv("REPLICATE_API_TOKEN")
         self.openai_key = os.getenv("OPENAI_API_KEY")
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared HTTP client, so every asset reuses pooled connections."""
+
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=120.0,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=16),
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the shared HTTP client."""
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def cache_path(
+        self, prompt: str, width: int, height: int, suffix: str = ".png"
+    ) -> Optional[Path]:
+        """Where an image for these inputs is cached, or None if it isn't cached.
+
+        Placeholders are cheap to redraw and never cached. Set
+        ASSET_CACHE_DISABLE=1 to force regeneration.
+        """
+
+        if os.getenv("ASSET_CACHE_DISABLE") == "1":
+            return None
+
+        if self.provider == "replicate" and self.replicate_token:
+            model = f"{SDXL_VERSION}|{SDXL_STEPS}"
+        elif self.provider == "openai" and self.openai_key:
+            model = f"{OPENAI_IMAGE_MODEL}|{OPENAI_IMAGE_QUALITY}"
+        else:
+            return None
+
+        key = hashlib.sha256(
+            f"{self.provider}|{model}|{prompt}|{width}|{height}".encode()
+        ).hexdigest()
+        return ASSET_CACHE_DIR / f"{key}{suffix}"
 
     async def generate(
         self,
@@ -207,64 +268,73 @@ class ImageGenerator:
         height: int,
         output_path: Path,
     ) -> Path:
-        """Generate an image from prompt."""
+        """Generate an image from prompt, reusing a cached one if available."""
+
+        cache_path = self.cache_path(prompt, width, height)
+        if cache_path is not None and cache_path.exists():
+            await asyncio.to_thread(shutil.copyfile, cache_path, output_path)
+            return output_path
 
         if self.provider == "replicate" and self.replicate_token:
-            return await self._generate_replicate(prompt, width, height, output_path)
+            await self._generate_replicate(prompt, width, height, output_path)
         elif self.provider == "openai" and self.openai_key:
-            return await self._generate_openai(prompt, width, height, output_path)
+            await self._generate_openai(prompt, width, height, output_path)
         else:
             return await self._generate_placeholder(prompt, width, height, output_path)
 
+        if cache_path is not None:
+            await asyncio.to_thread(_store_in_cache, output_path, cache_path)
+        return output_path
+
     async def _generate_replicate(
         self, prompt: str, width: int, height: int, output_path: Path
     ) -> Path:
         """Generate using Replicate (SDXL)."""
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            # Start prediction
-            response = await client.post(
-                "https://api.replicate.com/v1/predictions",
-                headers={"Authorization": f"Token {self.replicate_token}"},
-                json={
-                    "version": "39ed52f2a78e934b3ba6e2a89f5b1c712de7dfea535525255b1aa35c5565e08b",  # SDXL
-                    "input": {
-                        "prompt": prompt,
-                        "width": min(width, 1024),
-                        "height": min(height, 1024),
-                        "num_inference_steps": 30,
-                    },
+        client = self.client
+
+        # Start prediction; "Prefer: wait" holds the request open so
+        # short jobs come back already finished
+        response = await client.post(
+            "https://api.replicate.com/v1/predictions",
+            headers={
+                "Authorization": f"Token {self.replicate_token}",
+                "Prefer": "wait=60",
+            },
+            json={
+                "version": SDXL_VERSION,
+                "input": {
+                    "prompt": prompt,
+                    "width": min(width, 1024),
+                    "height": min(height, 1024),
+                    "num_inference_steps": SDXL_STEPS,
                 },
+            },
+        )
+        response.raise_for_status()
+        result = response.json()
+
+        # Poll for completion, backing off (with jitter so concurrent
+        # assets don't poll in lockstep)
+        delay = 0.5
+        while result["status"] not in ("succeeded", "failed", "canceled"):
+            await asyncio.sleep(delay + random.uniform(0, 0.3))
+            delay = min(delay * 1.5, 5.0)
+            status_response = await client.get(
+                result["urls"]["get"],
+                headers={"Authorization": f"Token {self.replicate_token}"},
             )
-            response.raise_for_status()
-            prediction = response.json()
-
-            # Poll for completion
-            while True:
-                await asyncio.sleep(3)
-                status_response = await client.get(
-                    prediction["urls"]["get"],
-                    headers={"Authorization": f"Token {self.replicate_token}"},
-                )
-                result = status_response.json()
-
-                if result["status"] == "succeeded":
-                    image_url = result["output"][0]
-                    break
-                elif result["status"] == "failed":
-                    raise RuntimeError(f"Generation failed: {result.get('error')}")
-
-            # Download and resize
-            img_response = await client.get(image_url)
-            output_path.write_bytes(img_response.content)
-
-            # Resize if needed
-            if width > 1024 or height > 1024:
-                img = Image.open(output_path)
-                img = img.resize((width, height), Image.Resampling.LANCZOS)
-                img.save(output_path)
+            status_response.raise_for_status()
+            result = status_response.json()
 
-            return output_path
+        if result["status"] != "succeeded":
+            raise RuntimeError(f"Generation failed: {result.get('error')}")
+        image_url = result["output"][0]
+
+        # Download, upscaling if SDXL couldn't produce the full size. SDXL
+        # output is smooth enough that bicubic is indistinguishable here.
+        resize = (width, height) if width > 1024 or height > 1024 else None
+        return await self._download(image_url, output_path, resize, Image.Resampling.BICUBIC)
 
     async def _generate_openai(
         self, prompt: str, width: int, height: int, output_path: Path
@@ -276,31 +346,45 @@ class ImageGenerator:
         if width == height:
             size = "1024x1024"
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                "https://api.openai.com/v1/images/generations",
-                headers={"Authorization": f"Bearer {self.openai_key}"},
-                json={
-                    "model": "dall-e-3",
-                    "prompt": prompt,
-                    "size": size,
-                    "quality": "standard",
-                    "n": 1,
-                },
-            )
-            response.raise_for_status()
-            result = response.json()
-
-            image_url = result["data"][0]["url"]
-            img_response = await client.get(image_url)
-            output_path.write_bytes(img_response.content)
+        client = self.client
+        response = await client.post(
+            "https://api.openai.com/v1/images/generations",
+            headers={"Authorization": f"Bearer {self.openai_key}"},
+            json={
+                "model": OPENAI_IMAGE_MODEL,
+                "prompt": prompt,
+                "size": size,
+                "quality": OPENAI_IMAGE_QUALITY,
+                "n": 1,
+            },
+        )
+        response.raise_for_status()
+        result = response.json()
+
+        # Download and resize to exact dimensions
+        image_url = result["data"][0]["url"]
+        return await self._download(image_url, output_path, (width, height))
+
+    async def _download(
+        self,
+        url: str,
+        output_path: Path,
+        resize: Optional[tuple[int, int]] = None,
+        resample: Image.Resampling = Image.Resampling.LANCZOS,
+    ) -> Path:
+        """Stream an image into memory, then resize and save it off the event loop."""
 
-            # Resize to exact dimensions
-            img = Image.open(output_path)
-            img = img.resize((width, height), Image.Resampling.LANCZOS)
-            img.save(output_path)
+        buf = io.BytesIO()
+        async with self.client.stream("GET", url) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(65536):
+                buf.write(chunk)
 
-            return output_path
+        if resize is None:
+            await asyncio.to_thread(output_path.write_bytes, buf.getvalue())
+        else:
+            await asyncio.to_thread(_resize_and_save, buf, resize, resample, output_path)
+        return output_path
 
     async def _generate_placeholder(
         self, prompt: str, width: int, height: int, output_path: Path
@@ -309,14 +393,14 @@ class ImageGenerator:
 
         from PIL import ImageDraw, ImageFont
 
-        # Create gradient background
-        img = Image.new("RGB", (width, height))
-        for y in range(height):
-            r = int(30 + (y / height) * 20)
-            g = int(30 + (y / height) * 10)
-            b = int(40 + (y / height) * 30)
-            for x in range(width):
-                img.putpixel((x, y), (r, g, b))
+        # Create gradient background (colors are computed per row,
+        # cast once, then copied across the width)
+        ys = np.arange(height)[:, None] / height
+        ramp = np.stack([30 + ys * 20, 30 + ys * 10, 40 + ys * 30], axis=-1)
+        img = Image.fromarray(
+            np.ascontiguousarray(np.broadcast_to(ramp.astype(np.uint8), (height, width, 3))),
+            "RGB",
+        )
 
         draw = ImageDraw.Draw(img)
 
@@ -338,13 +422,15 @@ class ImageGenerator:
         if current:
             lines.append(" ".join(current))
 
-        y_offset = height // 2 - len(lines) * 15
-        for line in lines[:8]:
-            bbox = draw.textbbox((0, 0), line, font=font)
-            text_width = bbox[2] - bbox[0]
-            x = (width - text_width) // 2
-            draw.text((x, y_offset), line, fill=(200, 200, 200), font=font)
-            y_offset += 30
+        draw.multiline_text(
+            (width // 2, height // 2 - len(lines) * 15),
+            "\n".join(lines[:8]),
+            fill=(200, 200, 200),
+            font=font,
+            anchor="ma",
+            spacing=6,
+            align="center",
+        )
 
         # Add "PLACEHOLDER" watermark
         draw.text((10, 10), "PLACEHOLDER - Add API key for real images", fill=(100, 100, 100), font=font)
@@ -353,15 +439,74 @@ class ImageGenerator:
         return output_path
 
 
-def remove_background(image_path: Path) -> Path:
-    """Remove background from image using rembg."""
+def _resize_and_save(
+    buf: io.BytesIO,
+    size: tuple[int, int],
+    resample: Image.Resampling,
+    output_path: Path,
+):
+    """Decode a downloaded image, resize it, and write it out."""
+
+    buf.seek(0)
+    img = Image.open(buf)
+    # Large downscales are box-reduced by a whole factor first, so the
+    # resample filter only covers the last (at least 2x) step
+    img = img.resize(size, resample, reducing_gap=2.0)
+    img.save(output_path)
+
+
+_rembg_session = None
+_rembg_session_lock = threading.Lock()
+
+
+def _ensure_rembg_session():
+    """Load the U²-Net model once, on the fastest available ONNX provider."""
+
+    global _rembg_session
+
+    with _rembg_session_lock:
+        if _rembg_session is None:
+            import onnxruntime
+            from rembg import new_session
+
+            available = onnxruntime.get_available_providers()
+            providers = [
+                p for p in ("CUDAExecutionProvider", "CoreMLExecutionProvider", "CPUExecutionProvider")
+                if p in available
+            ]
+            _rembg_session = new_session("u2net", providers=providers)
+    return _rembg_session
+
+
+def _store_in_cache(path: Path, cache_path: Path):
+    """Copy a finished image into the cache, atomically.
+
+    A copy rather than a link, since remove_background rewrites the
+    working file in place.
+    """
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+    os.close(fd)
+    shutil.copyfile(path, tmp)
+    os.replace(tmp, cache_path)
+
+
+def remove_background(image_path: Path, cache_path: Optional[Path] = None) -> Path:
+    """Remove background from image using rembg, cached at cache_path if given."""
+
+    if cache_path is not None and cache_path.exists():
+        shutil.copyfile(cache_path, image_path)
+        return image_path
 
     try:
         from rembg import remove
 
         img = Image.open(image_path)
-        output = remove(img)
+        output = remove(img, session=_ensure_rembg_session())
         output.save(image_path)
+        if cache_path is not None:
+            _store_in_cache(image_path, cache_path)
         return image_path
     except ImportError:
         console.print("[yellow]rembg not installed, skipping background removal[/yellow]")
@@ -377,6 +522,7 @@ async def generate_theme_assets(
     style_name: str = "cartoon",
     output_dir: Path = Path("./assets"),
     provider: str = "replicate",
+    max_concurrency: int = 4,
 ):
     """Generate all assets for a theme."""
 
@@ -403,57 +549,47 @@ async def generate_theme_assets(
 
     generator = ImageGenerator(provider)
 
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
-        # Generate backgrounds
-        for asset in theme.get("backgrounds", []):
-            task = progress.add_task(f"Generating {asset.name}...", total=None)
-            output_path = dirs["backgrounds"] / f"{asset.name}.png"
-
-            await generator.generate(
-                asset.prompt + style_suffix,
-                asset.width,
-                asset.height,
-                output_path,
-            )
-            progress.update(task, description=f"[green]{asset.name} complete!")
-
-        # Generate characters
-        for asset in theme.get("characters", []):
-            task = progress.add_task(f"Generating {asset.name}...", total=None)
-            output_path = dirs["characters"] / f"{asset.name}.png"
-
-            await generator.generate(
-                asset.prompt + style_suffix,
-                asset.width,
-                asset.height,
-                output_path,
-            )
-
-            if asset.remove_background:
-                remove_background(output_path)
+    # Backgrounds, characters and props are independent API round-trips,
+    # so run them all at once, bounded to stay under provider rate limits
+    semaphore = asyncio.Semaphore(max_concurrency)
 
-            progress.update(task, description=f"[green]{asset.name} complete!")
+    async def generate_one(progress: Progress, asset: AssetConfig, category: str):
+        task = progress.add_task(f"Generating {asset.name}...", total=None)
+        output_path = dirs[category] / f"{asset.name}.png"
+        prompt = asset.prompt + style_suffix
 
-        # Generate props
-        for asset in theme.get("props", []):
-            task = progress.add_task(f"Generating {asset.name}...", total=None)
-            output_path = dirs["props"] / f"{asset.name}.png"
+        async with semaphore:
+            await generator.generate(prompt, asset.width, asset.height, output_path)
 
-            await generator.generate(
-                asset.prompt + style_suffix,
-                asset.width,
-                asset.height,
-                output_path,
+        if asset.remove_background:
+            # rembg runs blocking ONNX inference; keep it off the event loop
+            nobg_cache = generator.cache_path(prompt, asset.width, asset.height, ".nobg.png")
+            removal = asyncio.ensure_future(
+                asyncio.to_thread(remove_background, output_path, nobg_cache)
             )
+            try:
+                await asyncio.shield(removal)
+            except asyncio.CancelledError:
+                # The thread can't be interrupted; let it finish before unwinding
+                await asyncio.wait([removal])
+                raise
 
-            if asset.remove_background:
-                remove_background(output_path)
+        progress.update(task, description=f"[green]{asset.name} complete!")
 
-            progress.update(task, description=f"[green]{asset.name} complete!")
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+        ) as progress:
+            # The task group cancels (and waits for) every sibling if one
+            # asset fails, so none outlive the shared client closed below
+            async with asyncio.TaskGroup() as tg:
+                for category in dirs:
+                    for asset in theme.get(category, []):
+                        tg.create_task(generate_one(progress, asset, category))
+    finally:
+        await generator.aclose()
 
     # Generate manifest
     manifest = {
@@ -490,9 +626,10 @@ def main():
         style: str = typer.Option("cartoon", help="Visual style (cartoon, anime, realistic, minimal, retro)"),
         output_dir: Path = typer.Option(Path("./assets"), help="Output directory"),
         provider: str = typer.Option("replicate", help="AI provider (replicate, openai)"),
+        max_concurrency: int = typer.Option(4, help="Assets generated at once"),
     ):
         """Generate all assets for a theme."""
-        asyncio.run(generate_theme_assets(theme, style, output_dir, provider))
+        asyncio.run(generate_theme_assets(theme, style, output_dir, provider, max_concurrency))
 
     @app.command()
     def list_themes():
@@ -8,11 +8,14 @@ Coordinates AI asset generation, Rust frame rendering, TTS, and final compilatio
 import asyncio
 import json
 import os
+import re
 import subprocess
 import sys
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
 from dotenv import load_dotenv
 from rich.console import Console
 from rich.panel import Panel
@@ -22,6 +25,42 @@ load_dotenv()
 console = Console()
 
 
+@lru_cache(maxsize=None)
+def _h264_encoder_args() -> tuple[str, ...]:
+    """Pick H.264 encoder flags, preferring a hardware encoder if one works.
+
+    Probed once per process. The video is encoded once for upload, so the
+    software fallback trades a little size for a much faster preset.
+    """
+
+    hardware = [
+        ("h264_nvenc", ("-preset", "p4", "-rc", "vbr", "-cq", "23", "-b:v", "0")),
+        ("h264_videotoolbox", ("-b:v", "8M")),
+    ]
+    try:
+        encoders = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True, text=True,
+        ).stdout
+    except OSError:
+        encoders = ""
+
+    for encoder, flags in hardware:
+        if encoder not in encoders:
+            continue
+        # Builds can list an encoder whose hardware isn't present
+        probe = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-f", "lavfi",
+             "-i", "color=size=256x256:duration=0.1",
+             "-c:v", encoder, "-f", "null", "-"],
+            capture_output=True,
+        )
+        if probe.returncode == 0:
+            return ("-c:v", encoder, *flags)
+
+    return ("-c:v", "libx264", "-preset", "veryfast", "-crf", "23")
+
+
 class HybridPipeline:
     """Orchestrates the complete hybrid video pipeline."""
 
@@ -58,24 +97,43 @@ class HybridPipeline:
             console=console,
         ) as progress:
 
-            # Step 1: Generate AI assets
-            task = progress.add_task("Step 1/4: Generating AI assets...", total=None)
-            await self._generate_assets()
-            progress.update(task, description="[green]Step 1/4: AI assets generated!")
+            # Steps 1 and 3 are network-bound and the Rust build is
+            # CPU-bound, so run all three at once; the task group cancels
+            # the others if one fails
+            assets_step = progress.add_task("Step 1/4: Generating AI assets...", total=None)
+            voiceover_step = progress.add_task("Step 3/4: Generating voiceover...", total=None)
 
-            # Step 2: Generate frames with Rust engine
-            task = progress.add_task("Step 2/4: Rendering frames with Rust engine...", total=None)
-            await self._render_frames()
-            progress.update(task, description="[green]Step 2/4: Frames rendered!")
+            async def generate_assets():
+                await self._generate_assets()
+                progress.update(assets_step, description="[green]Step 1/4: AI assets generated!")
+
+            async def generate_voiceover() -> Path:
+                audio_path = await self._generate_voiceover()
+                progress.update(voiceover_step, description="[green]Step 3/4: Voiceover generated!")
+                return audio_path
 
-            # Step 3: Generate voiceover
-            task = progress.add_task("Step 3/4: Generating voiceover...", total=None)
-            audio_path = await self._generate_voiceover()
-            progress.update(task, description="[green]Step 3/4: Voiceover generated!")
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(generate_assets())
+                build_task = tg.create_task(self._build_rust())
+                voiceover_task = tg.create_task(generate_voiceover())
+            rust_built = build_task.result()
+            audio_path = voiceover_task.result()
 
-            # Step 4: Compile final video
+            # Step 2: Generate frames with Rust engine
+            task = progress.add_task("Step 2/4: Rendering frames with Rust engine...", total=None)
+            frames_rendered = rust_built and await self._render_frames()
+            if frames_rendered:
+                progress.update(task, description="[green]Step 2/4: Frames rendered!")
+            else:
+                progress.update(task, description="[yellow]Step 2/4: Deferred to Python renderer")
+
+            # Step 4: Compile final video (the Python fallback renders
+            # straight into the encoder here, so it needs the audio first)
             task = progress.add_task("Step 4/4: Compiling final video...", total=None)
-            video_path = await self._compile_video(audio_path)
+            if frames_rendered:
+                video_path = await self._compile_video(audio_path)
+            else:
+                video_path = await self._render_video_python(audio_path)
             progress.update(task, description="[green]Step 4/4: Video compiled!")
 
         console.print(f"\n[bold green]Video saved to:[/bold green] {video_path}")
@@ -94,47 +152,86 @@ class HybridPipeline:
             provider="replicate" if os.getenv("REPLICATE_API_TOKEN") else "placeholder",
         )
 
-    async def _render_frames(self):
-        """Render video frames using the Rust engine."""
+    async def _build_rust(self) -> bool:
+        """Build the Rust engine, unless its release binary is already current.
+
+        Returns False when the Python fallback renderer should be used instead.
+        """
 
         # Check if Rust project exists
         if not self.rust_project.exists():
             console.print("[yellow]Rust project not found, using Python fallback renderer[/yellow]")
-            await self._render_frames_python()
-            return
+            return False
 
-        # Build and run Rust project
-        result = subprocess.run(
-            ["cargo", "build", "--release"],
+        if self._rust_binary_is_fresh():
+            return True
+
+        proc = await asyncio.create_subprocess_exec(
+            "cargo", "build", "--release",
             cwd=self.rust_project,
-            capture_output=True,
-            text=True,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
-
-        if result.returncode != 0:
+        try:
+            await proc.communicate()
+        except asyncio.CancelledError:
+            # Another startup step failed; don't leave cargo running
+            proc.kill()
+            await proc.wait()
+            raise
+
+        if proc.returncode != 0:
             console.print(f"[yellow]Rust build failed, using Python fallback[/yellow]")
-            await self._render_frames_python()
-            return
+            return False
+
+        return True
+
+    def _rust_binary_is_fresh(self) -> bool:
+        """Whether the release binary is newer than every build input."""
+
+        manifest = self.rust_project / "Cargo.toml"
+        match = re.search(r'^name\s*=\s*"([^"]+)"', manifest.read_text(), re.MULTILINE)
+        if not match:
+            return False
+
+        binary = self.rust_project / "target" / "release" / match.group(1)
+        if sys.platform == "win32":
+            binary = binary.with_suffix(".exe")
+        if not binary.exists():
+            return False
+
+        inputs = [manifest, self.rust_project / "Cargo.lock", *(self.rust_project / "src").rglob("*.rs")]
+        newest_input = max(p.stat().st_mtime for p in inputs if p.exists())
+        return binary.stat().st_mtime > newest_input
+
+    async def _render_frames(self) -> bool:
+        """Render video frames using the (already built) Rust engine.
+
+        Returns False when the Python fallback renderer should be used instead.
+        """
 
         # Run with assets directory
         env = os.environ.copy()
         env["ASSETS_DIR"] = str(self.assets_dir.absolute())
         env["OUTPUT_DIR"] = str(self.frames_dir.absolute())
 
-        result = subprocess.run(
-            ["cargo", "run", "--release"],
+        proc = await asyncio.create_subprocess_exec(
+            "cargo", "run", "--release",
             cwd=self.rust_project,
             env=env,
-            capture_output=True,
-            text=True,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
+        _, stderr = await proc.communicate()
+
+        if proc.returncode != 0:
+            console.print(f"[red]Rust execution failed: {stderr.decode()}[/red]")
+            return False
 
-        if result.returncode != 0:
-            console.print(f"[red]Rust execution failed: {result.stderr}[/red]")
-            await self._render_frames_python()
+        return True
 
-    async def _render_frames_python(self):
-        """Fallback Python frame renderer."""
+    async def _render_video_python(self, audio_path: Path) -> Path:
+        """Fallback Python renderer, encoding one still per run of identical frames."""
 
         from PIL import Image, ImageDraw, ImageFont
 
@@ -161,14 +258,14 @@ class HybridPipeline:
                 backgrounds.append(Image.open(bg_path).resize((width, height)))
 
         if not backgrounds:
-            # Create default gradient background
-            bg = Image.new("RGB", (width, height))
-            for y in range(height):
-                r = int(20 + (y / height) * 20)
-                g = int(15 + (y / height) * 15)
-                b = int(30 + (y / height) * 20)
-                for x in range(width):
-                    bg.putpixel((x, y), (r, g, b))
+            # Create default gradient background (colors are computed per
+            # row, cast once, then copied across the width)
+            ys = np.arange(height)[:, None] / height
+            ramp = np.stack([20 + ys * 20, 15 + ys * 15, 30 + ys * 20], axis=-1)
+            bg = Image.fromarray(
+                np.ascontiguousarray(np.broadcast_to(ramp.astype(np.uint8), (height, width, 3))),
+                "RGB",
+            )
             backgrounds = [bg]
 
         # Load character if available
@@ -190,67 +287,117 @@ class HybridPipeline:
             {"start": 70, "end": 75, "text": "Who wants to play?", "bg_idx": 3 if len(backgrounds) > 3 else 0},
         ]
 
+        # Column view of the scene table for the render steps below
+        scene_starts = np.array([scene["start"] for scene in scenes])
+        scene_text = [scene["text"] for scene in scenes]
+        scene_bg_idx = np.array([scene["bg_idx"] for scene in scenes], dtype=np.int32) % len(backgrounds)
+
         try:
             font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 80)
         except OSError:
             font = ImageFont.load_default()
 
-        console.print(f"Rendering {total_frames} frames...")
-
-        for frame_num in range(total_frames):
-            time = frame_num / fps
-
-            # Find current scene
-            current_scene = scenes[0]
-            for scene in scenes:
-                if scene["start"] <= time < scene["end"]:
-                    current_scene = scene
-                    break
-
-            # Create frame
-            bg_idx = current_scene["bg_idx"] % len(backgrounds)
-            frame = backgrounds[bg_idx].copy()
-            draw = ImageDraw.Draw(frame)
-
-            # Add text
-            text = current_scene["text"]
-            lines = text.split("\n")
-            y_offset = height // 3
+        # Bake each scene's background and text once; within a scene only
+        # the character changes
+        scene_bases = []
+        for text, bg_idx in zip(scene_text, scene_bg_idx):
+            base = backgrounds[bg_idx].convert("RGB")
+            draw = ImageDraw.Draw(base)
+
+            # Add text, centered, with a black outline in place of a shadow
+            draw.multiline_text(
+                (width // 2, height // 3),
+                text,
+                fill=(255, 255, 255),
+                font=font,
+                anchor="ma",
+                spacing=20,
+                align="center",
+                stroke_width=4,
+                stroke_fill=(0, 0, 0),
+            )
+
+            scene_bases.append(base)
+
+        # Scale each character once, positioned at bottom center, and split
+        # off its alpha so pasting doesn't extract the mask again each time
+        char_height = int(height * 0.5)
+        char_cache = []
+        for char in characters:
+            char_width = int(char.width * (char_height / char.height))
+            char_resized = char.resize((char_width, char_height), Image.Resampling.LANCZOS)
+            char_pos = ((width - char_width) // 2, height - char_height + 50)
+            char_cache.append((char_resized.convert("RGB"), char_resized.getchannel("A"), char_pos))
+
+        # Scene and character (-1 for none) shown on every frame
+        frame_nums = np.arange(total_frames)
+        scene_of_frame = np.maximum(
+            np.searchsorted(scene_starts, frame_nums / fps, side="right") - 1, 0
+        )
+        if char_cache:
+            char_of_frame = np.minimum(
+                frame_nums // (total_frames // len(char_cache)), len(char_cache) - 1
+            )
+        else:
+            char_of_frame = np.full(total_frames, -1)
+
+        # Frames only change at scene cuts and character switches, so find
+        # the runs of identical frames as (first_frame, scene_idx, char_idx)
+        changed = (np.diff(scene_of_frame) != 0) | (np.diff(char_of_frame) != 0)
+        run_starts = np.concatenate(([0], np.flatnonzero(changed) + 1))
+        segments = [
+            (int(f), int(scene_of_frame[f]), int(char_of_frame[f])) for f in run_starts
+        ]
 
-            for line in lines:
-                bbox = draw.textbbox((0, 0), line, font=font)
-                text_width = bbox[2] - bbox[0]
-                x = (width - text_width) // 2
+        console.print(f"Rendering {len(segments)} stills for {total_frames} frames...")
 
-                # Draw shadow
-                draw.text((x + 4, y_offset + 4), line, fill=(0, 0, 0), font=font)
-                # Draw text
-                draw.text((x, y_offset), line, fill=(255, 255, 255), font=font)
-                y_offset += 100
+        # Render one still per run and have the concat demuxer hold each
+        # for the run's duration
+        concat_lines = []
+        for i, (first_frame, scene_idx, char_idx) in enumerate(segments):
+            frame = scene_bases[scene_idx].copy()
+            if char_idx >= 0:
+                char_rgb, char_alpha, char_pos = char_cache[char_idx]
+                frame.paste(char_rgb, char_pos, char_alpha)
 
-            # Add character if available
-            if characters:
-                char_idx = frame_num // (total_frames // len(characters)) if len(characters) > 1 else 0
-                char_idx = min(char_idx, len(characters) - 1)
-                char = characters[char_idx]
+            still_path = self.frames_dir / f"still_{i:03d}.png"
+            frame.save(still_path, compress_level=1)
 
-                # Scale character
-                char_height = int(height * 0.5)
-                char_width = int(char.width * (char_height / char.height))
-                char_resized = char.resize((char_width, char_height))
+            last_frame = segments[i + 1][0] if i + 1 < len(segments) else total_frames
+            concat_lines.append(f"file '{still_path.absolute()}'")
+            concat_lines.append(f"duration {(last_frame - first_frame) / fps}")
+        # The demuxer ignores the final duration unless the file is repeated
+        concat_lines.append(concat_lines[-2])
 
-                # Position at bottom center
-                char_x = (width - char_width) // 2
-                char_y = height - char_height + 50
+        concat_file = self.frames_dir / "stills.txt"
+        concat_file.write_text("\n".join(concat_lines) + "\n")
 
-                frame.paste(char_resized, (char_x, char_y), char_resized)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = self.output_dir / f"hybrid_video_{timestamp}.mp4"
 
-            # Save frame
-            frame_path = self.frames_dir / f"frame_{frame_num:05d}.png"
-            frame.save(frame_path)
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-y",
+            "-hide_banner", "-loglevel", "error",
+            "-f", "concat",
+            "-safe", "0",
+            "-i", str(concat_file),
+            "-i", str(audio_path),
+            "-vf", f"fps={fps}",
+            *_h264_encoder_args(),
+            "-pix_fmt", "yuv420p",
+            "-c:a", "aac",
+            "-b:a", "192k",
+            "-shortest",
+            "-movflags", "+faststart",
+            str(output_path),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await proc.communicate()
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, "ffmpeg", stderr=stderr)
 
-            if frame_num % 100 == 0:
-                console.print(f"  Frame {frame_num}/{total_frames}")
+        return output_path
 
     async def _generate_voiceover(self) -> Path:
         """Generate TTS voiceover."""
@@ -295,9 +442,7 @@ This game has ended friendships. Who wants to play?"""
             "-framerate", "30",
             "-i", str(self.frames_dir / "frame_%05d.png"),
             "-i", str(audio_path),
-            "-c:v", "libx264",
-            "-preset", "medium",
-            "-crf", "23",
+            *_h264_encoder_args(),
             "-pix_fmt", "yuv420p",
             "-c:a", "aac",
             "-b:a", "192k",